@@ -0,0 +1,46 @@
+from utils.config import GRID_WIDTH, GRID_HEIGHT, CONGESTION_DECAY, CONGESTION_WEIGHT
+
+class CongestionMap:
+    """Decaying per-cell traffic density used as an extra edge cost by the planner"""
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, decay=CONGESTION_DECAY, weight=CONGESTION_WEIGHT):
+        self.width = width
+        self.height = height
+        self.decay = decay
+        self.weight = weight
+        self.tick = 0
+
+        # Density is decayed lazily: each cell keeps its value and the tick it was last touched
+        self.density = [[0.0] * height for _ in range(width)]
+        self.last_tick = [[0] * height for _ in range(width)]
+
+    def _decayed(self, x, y):
+        """Return the cell's density brought forward to the current tick"""
+        value = self.density[x][y]
+        if value:
+            elapsed = self.tick - self.last_tick[x][y]
+            if elapsed:
+                value *= self.decay ** elapsed
+        return value
+
+    def record(self, positions):
+        """Advance one tick and add one unit of occupancy for every position in the batch"""
+        self.tick += 1
+        for x, y in positions:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self.density[x][y] = self._decayed(x, y) + 1.0
+                self.last_tick[x][y] = self.tick
+
+    def density_at(self, x, y):
+        """Current decayed density of a cell"""
+        return self._decayed(x, y)
+
+    def cost(self, x, y):
+        """Extra cost of entering a cell (added to the base step cost of 1)"""
+        return self.weight * self._decayed(x, y)
+
+    def reset(self):
+        """Clear all recorded traffic"""
+        self.tick = 0
+        self.density = [[0.0] * self.height for _ in range(self.width)]
+        self.last_tick = [[0] * self.height for _ in range(self.width)]
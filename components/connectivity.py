@@ -0,0 +1,135 @@
+from collections import deque
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+class ComponentLabels:
+    """Connected-component labels of the free cells in the grid's static obstacle layer
+
+    Labels are built once by flood fill and then maintained incrementally as
+    static obstacles are added or removed, so reachability queries are O(1).
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = {}    # Free cell -> component id
+        self.members = {}   # Component id -> set of its cells
+        self.next_label = 0
+        self.dirty = True
+
+    def mark_dirty(self):
+        """Invalidate the labels so they are rebuilt from scratch on the next query"""
+        self.dirty = True
+
+    def _neighbors(self, cell):
+        """In-bounds 4-neighbours of a cell"""
+        x, y = cell
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height:
+                yield (nx, ny)
+
+    def _new_label(self):
+        label = self.next_label
+        self.next_label += 1
+        self.members[label] = set()
+        return label
+
+    def _relabel(self):
+        """Flood-fill every free cell of the static layer"""
+        self.labels = {}
+        self.members = {}
+        self.next_label = 0
+        for x in range(self.grid.width):
+            for y in range(self.grid.height):
+                if (x, y) in self.labels or (x, y) in self.grid.static_obstacles:
+                    continue
+                label = self._new_label()
+                for cell in self._flood((x, y), lambda cell: cell not in self.labels
+                                        and cell not in self.grid.static_obstacles):
+                    self.labels[cell] = label
+                    self.members[label].add(cell)
+        self.dirty = False
+
+    def _flood(self, seed, passable, targets=None):
+        """Breadth-first region grown from seed through passable cells
+
+        If targets is given, stop as soon as all of them have been reached.
+        Returns the visited cells.
+        """
+        visited = {seed}
+        remaining = set(targets) - visited if targets else None
+        queue = deque([seed])
+        while queue:
+            if remaining is not None and not remaining:
+                break
+            for neighbor in self._neighbors(queue.popleft()):
+                if neighbor not in visited and passable(neighbor):
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+                    if remaining is not None:
+                        remaining.discard(neighbor)
+        return visited
+
+    def add_obstacle(self, cell):
+        """Update the labels after a static obstacle was placed on cell"""
+        if self.dirty or cell not in self.labels:
+            return
+        old = self.labels.pop(cell)
+        self.members[old].discard(cell)
+        if not self.members[old]:
+            del self.members[old]
+            return
+
+        # The component can only split between the cell's former neighbours
+        pending = [n for n in self._neighbors(cell) if self.labels.get(n) == old]
+        in_old = lambda c: self.labels.get(c) == old
+        while len(pending) > 1:
+            seed = pending.pop()
+            region = self._flood(seed, in_old, pending)
+            pending = [n for n in pending if n not in region]
+            if not pending:
+                break  # Everything still connected, stopped early
+
+            # The seed's region was fully explored and is cut off from the rest
+            label = self._new_label()
+            for c in region:
+                self.labels[c] = label
+            self.members[label] = region
+            self.members[old] -= region
+
+    def remove_obstacle(self, cell):
+        """Update the labels after the static obstacle on cell was removed"""
+        x, y = cell
+        if self.dirty or cell in self.labels or not (0 <= x < self.grid.width and 0 <= y < self.grid.height):
+            return
+        adjacent = {self.labels[n] for n in self._neighbors(cell) if n in self.labels}
+        if not adjacent:
+            target = self._new_label()
+        else:
+            # Merge the smaller components into the largest one
+            target = max(adjacent, key=lambda label: len(self.members[label]))
+            for label in adjacent - {target}:
+                for c in self.members.pop(label):
+                    self.labels[c] = target
+                    self.members[target].add(c)
+        self.labels[cell] = target
+        self.members[target].add(cell)
+
+    def label(self, cell):
+        """Component id of a cell, or None if it is a static obstacle or off the grid"""
+        if self.dirty:
+            self._relabel()
+        return self.labels.get(cell)
+
+    def is_reachable(self, start, goal):
+        """Check whether goal can be reached from start through the static layer"""
+        goal_label = self.label(goal)
+        if goal_label is None:
+            return False
+
+        start_label = self.label(start)
+        if start_label is not None:
+            return start_label == goal_label
+
+        # Start is covered by a static obstacle (e.g. one placed on a car): it can still leave it
+        return any(self.label(n) == goal_label for n in self._neighbors(start))
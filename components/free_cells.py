@@ -0,0 +1,49 @@
+import random
+
+class FreeCellIndex:
+    """Indexed set of free cells supporting O(1) add, remove and uniform sampling"""
+
+    def __init__(self, cells=()):
+        self.cells = []     # Dense array of free cells
+        self.index = {}     # Cell -> position in self.cells
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        """Mark a cell as free"""
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        """Mark a cell as occupied (swap the last cell into its slot)"""
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def sample(self, exclude=None, attempts=10):
+        """Return a uniformly random free cell not in exclude, or None if there is none"""
+        if not self.cells:
+            return None
+        if not exclude:
+            return random.choice(self.cells)
+
+        # A few cheap O(1) draws first; exclude is normally tiny compared to the free set
+        for _ in range(attempts):
+            cell = random.choice(self.cells)
+            if cell not in exclude:
+                return cell
+
+        # Densely excluded: fall back to an exact draw over the remaining cells
+        candidates = [cell for cell in self.cells if cell not in exclude]
+        return random.choice(candidates) if candidates else None
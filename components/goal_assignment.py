@@ -0,0 +1,42 @@
+from components.pathfinding import manhattan_distance
+from utils.config import GOAL_MIN_DISTANCE, GOAL_SAMPLE_ATTEMPTS
+
+class GoalAssigner:
+    """Hands out random reachable goals sampled from the grid's free-cell index"""
+
+    def __init__(self, grid, min_distance=GOAL_MIN_DISTANCE, attempts=GOAL_SAMPLE_ATTEMPTS):
+        self.grid = grid
+        self.min_distance = min_distance
+        self.attempts = attempts
+
+    def assign(self, start, reserved=None):
+        """Pick a free goal reachable from start, avoiding reserved cells; None if there is none"""
+        exclude = set(reserved) if reserved else set()
+        exclude.add(start)
+        components = self.grid.components
+        fallback = None
+
+        for _ in range(self.attempts):
+            goal = self.grid.free_cells.sample(exclude)
+            if goal is None:
+                break
+            if not components.is_reachable(start, goal):
+                continue
+            if manhattan_distance(start, goal) >= self.min_distance:
+                return goal
+            # Reachable but close: keep it in case nothing farther turns up
+            if fallback is None:
+                fallback = goal
+
+        return fallback
+
+    def assign_batch(self, starts):
+        """Assign distinct goals to many starts at once (e.g. all cars that arrived this tick)"""
+        reserved = set()
+        goals = []
+        for start in starts:
+            goal = self.assign(start, reserved)
+            if goal is not None:
+                reserved.add(goal)
+            goals.append(goal)
+        return goals
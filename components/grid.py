@@ -1,4 +1,6 @@
 import pygame
+from components.free_cells import FreeCellIndex
+from components.connectivity import ComponentLabels
 from utils.config import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, WHITE, BLACK, GREEN
 
 class Grid:
@@ -10,6 +12,10 @@ class Grid:
         self.dynamic_obstacles = set()
         self.static_obstacles = set()
 
+        # Free cells for O(1) random sampling, and reachability labels of the static layer
+        self.free_cells = FreeCellIndex((x, y) for x in range(self.width) for y in range(self.height))
+        self.components = ComponentLabels(self)
+
     def draw(self, screen, goal_x, goal_y):
         """Draw the grid, goal state, and obstacles"""
         screen.fill(BLACK)
@@ -24,17 +30,40 @@ class Grid:
         goal_rect = pygame.Rect(goal_x * CELL_SIZE, goal_y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
         pygame.draw.rect(screen, GREEN, goal_rect)
 
+    def _refresh_free_cell(self, x, y):
+        """Keep the free-cell index in sync with the obstacle sets"""
+        if self.is_obstacle(x, y):
+            self.free_cells.remove((x, y))
+        elif 0 <= x < self.width and 0 <= y < self.height:
+            self.free_cells.add((x, y))
+
     def add_dynamic_obstacle(self, x, y):
         """Add dynamic obstacle to the grid"""
         self.dynamic_obstacles.add((x, y))
+        self._refresh_free_cell(x, y)
 
     def remove_dynamic_obstacle(self, x, y):
         """Remove dynamic obstacle from the grid"""
         self.dynamic_obstacles.discard((x, y))
+        self._refresh_free_cell(x, y)
         
     def add_static_obstacle(self, x, y):
         """Add static obstacle to the grid"""
         self.static_obstacles.add((x, y))
+        self._refresh_free_cell(x, y)
+        self.components.add_obstacle((x, y))
+
+    def remove_static_obstacle(self, x, y):
+        """Remove static obstacle from the grid"""
+        self.static_obstacles.discard((x, y))
+        self._refresh_free_cell(x, y)
+        self.components.remove_obstacle((x, y))
+
+    def clear_static_obstacles(self):
+        """Remove every static obstacle from the grid"""
+        self.components.mark_dirty()  # Cheaper to rebuild once than to merge cell by cell
+        for x, y in list(self.static_obstacles):
+            self.remove_static_obstacle(x, y)
 
     def is_obstacle(self, x, y):
         """Check if cell is occupied by any obstacle"""
@@ -1,14 +1,17 @@
 import pygame
-from utils.config import CELL_SIZE, GRID_WIDTH, GRID_HEIGHT, WHITE, BLACK
+from utils.config import CELL_SIZE, GRID_WIDTH, GRID_HEIGHT, WHITE, BLACK, GREEN, ORANGE, LIGHT_BLUE, DARK_GREY
 
 class MetricsPanel:
     """Side panel to display simulation metrics and controls"""
     
-    def __init__(self, panel_width=200):
+    def __init__(self, panel_width=200, metrics_store=None):
         self.panel_width = panel_width
+        self.metrics_store = metrics_store  # Optional MetricsStore driving the trend graphs
+        self.status = ""  # Short message shown next to the trends title (e.g. export result)
         self.panel_height = GRID_HEIGHT * CELL_SIZE
         self.panel_x = GRID_WIDTH * CELL_SIZE
         self.font = pygame.font.SysFont('Arial', 16)
+        self.small_font = pygame.font.SysFont('Arial', 13)
         self.title_font = pygame.font.SysFont('Arial', 20, bold=True)
         
         # Metrics to track
@@ -68,6 +71,7 @@ class MetricsPanel:
             "Click: Add/Remove Obstacle",
             "R: Reset Simulation",
             "P: Pause/Resume",
+            "E: Export Metrics",
             "ESC: Quit"
         ]
         
@@ -75,4 +79,66 @@ class MetricsPanel:
         for text in control_texts:
             rendered_text = self.font.render(text, True, WHITE)
             screen.blit(rendered_text, (self.panel_x + 15, y_pos))
-            y_pos += 25
\ No newline at end of file
+            y_pos += 25
+        
+        # Draw rolling trends
+        if self.metrics_store is not None:
+            self.draw_trends(screen, y_pos + 10)
+    
+    def set_status(self, message):
+        """Set the short status message shown in the trends section"""
+        self.status = message
+    
+    def draw_trends(self, screen, y_pos):
+        """Draw sparklines of the rolling metrics window"""
+        store = self.metrics_store
+        trends_title = self.title_font.render("TRENDS", True, WHITE)
+        screen.blit(trends_title, (self.panel_x + 10, y_pos))
+        if self.status:
+            status = self.small_font.render(self.status, True, LIGHT_BLUE)
+            screen.blit(status, (self.panel_x + 20 + trends_title.get_width(), y_pos + 4))
+        y_pos += 30
+        
+        sparklines = [
+            (f"Throughput: {store.throughput():.3f}/tick", store.arrivals, GREEN),
+            (f"Replans: {store.replan_rate():.2f}/tick", store.replans, ORANGE),
+            (f"Planner: {store.planner_ms.mean():.2f} ms/tick", store.planner_ms, LIGHT_BLUE)
+        ]
+        
+        for label, series, color in sparklines:
+            text = self.small_font.render(label, True, WHITE)
+            screen.blit(text, (self.panel_x + 15, y_pos))
+            rect = pygame.Rect(self.panel_x + 15, y_pos + 16, self.panel_width - 30, 22)
+            self.draw_sparkline(screen, series.values(), rect, color)
+            y_pos += 40
+        
+        # Drawn every frame: compute just these aggregates, not the full summary
+        text_lines = [
+            f"Planner p95: {store.latency_percentile(95):.2f} ms/call",
+            f"Coll/1k: {store.collisions_per_1k():.1f}  Trip p95: {store.trip_times.percentile(95):.0f}"
+        ]
+        for line in text_lines:
+            text = self.small_font.render(line, True, WHITE)
+            screen.blit(text, (self.panel_x + 15, y_pos))
+            y_pos += 16
+    
+    def draw_sparkline(self, screen, values, rect, color):
+        """Draw values as a line graph scaled to fit rect (one bucket mean per pixel)"""
+        pygame.draw.rect(screen, DARK_GREY, rect, 1)
+        if len(values) < 2:
+            return
+        
+        # Downsample to at most one point per pixel column
+        buckets = min(len(values), rect.width)
+        points = []
+        for i in range(buckets):
+            chunk = values[i * len(values) // buckets:(i + 1) * len(values) // buckets]
+            points.append(sum(chunk) / len(chunk))
+        
+        peak = max(points) or 1
+        coords = [
+            (rect.x + i * (rect.width - 1) // max(1, buckets - 1),
+             rect.bottom - 1 - int(value / peak * (rect.height - 2)))
+            for i, value in enumerate(points)
+        ]
+        pygame.draw.lines(screen, color, False, coords)
@@ -0,0 +1,191 @@
+import csv
+import math
+import os
+from components.pathfinding import drain_planner_latencies
+from utils.config import METRICS_WINDOW, METRICS_LATENCY_SAMPLES, METRICS_TRIP_SAMPLES
+
+class RingBuffer:
+    """Fixed-capacity buffer that overwrites its oldest value once full"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = [0.0] * capacity
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        """Add a value, dropping the oldest one if the buffer is full"""
+        end = (self.start + self.count) % self.capacity
+        self.data[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def values(self):
+        """Buffered values, oldest first"""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.data[self.start:end]
+        return self.data[self.start:] + self.data[:end - self.capacity]
+
+    def total(self):
+        return sum(self.values())
+
+    def mean(self):
+        return self.total() / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Nearest-rank percentile (p in 0-100) of the buffered values"""
+        if not self.count:
+            return 0.0
+        return self.percentiles(p)[0]
+
+    def percentiles(self, *ps):
+        """Several nearest-rank percentiles from a single sort"""
+        if not self.count:
+            return [0.0] * len(ps)
+        ordered = sorted(self.values())
+        return [ordered[min(self.count, max(1, math.ceil(p / 100 * self.count))) - 1] for p in ps]
+
+
+class MetricsStore:
+    """Fixed-memory time series of simulation metrics with rolling aggregates"""
+
+    COLUMNS = ["tick", "arrivals", "replans", "collisions", "planner_calls", "planner_ms"]
+
+    def __init__(self, window=METRICS_WINDOW, latency_samples=METRICS_LATENCY_SAMPLES,
+                 trip_samples=METRICS_TRIP_SAMPLES):
+        self.window = window
+        self.tick = 0
+
+        # Per-tick series over the rolling window
+        self.ticks = RingBuffer(window)
+        self.arrivals = RingBuffer(window)
+        self.replans = RingBuffer(window)
+        self.collisions = RingBuffer(window)
+        self.planner_calls = RingBuffer(window)
+        self.planner_ms = RingBuffer(window)
+
+        # Most recent individual samples
+        self.latencies = RingBuffer(latency_samples)  # Milliseconds per a_star call
+        self.trip_times = RingBuffer(trip_samples)    # Ticks from goal assignment to arrival
+
+        # Last cumulative counters seen, used to turn totals into per-tick deltas
+        self.last_totals = {"replans": 0, "collisions": 0}
+
+    def _delta(self, key, total):
+        """Per-tick increase of a cumulative counter (counters restart on reset)"""
+        last = self.last_totals[key]
+        self.last_totals[key] = total
+        return total - last if total >= last else total
+
+    def record_tick(self, arrivals, replans, collisions, latencies=()):
+        """Append one tick of raw values"""
+        self.tick += 1
+        self.ticks.append(self.tick)
+        self.arrivals.append(arrivals)
+        self.replans.append(replans)
+        self.collisions.append(collisions)
+        self.planner_calls.append(len(latencies))
+        self.planner_ms.append(sum(latencies))
+        for latency in latencies:
+            self.latencies.append(latency)
+
+    def record_trip(self, duration):
+        """Record the duration of a completed trip"""
+        self.trip_times.append(duration)
+
+    def update(self, player_car, traffic, traffic_manager):
+        """Sample the simulation once per tick"""
+        trips = traffic.drain_completed_trips()
+        for duration in trips:
+            self.record_trip(duration)
+
+        # Only the callers of a_star count: TrafficManager merely clears paths for them to replan
+        replans = player_car.recalculations + traffic.recalculations
+        self.record_tick(
+            len(trips),
+            self._delta("replans", replans),
+            self._delta("collisions", traffic_manager.collision_count),
+            drain_planner_latencies()
+        )
+
+    def throughput(self):
+        """Goals reached per tick over the window"""
+        return self.arrivals.mean()
+
+    def replan_rate(self):
+        """Path recalculations per tick over the window"""
+        return self.replans.mean()
+
+    def collisions_per_1k(self):
+        """Collisions per 1000 ticks over the window"""
+        return self.collisions.mean() * 1000
+
+    def latency_percentile(self, p):
+        """Planner latency percentile in milliseconds"""
+        return self.latencies.percentile(p)
+
+    def summary(self):
+        """Current rolling aggregates"""
+        p50, p95, p99 = self.latencies.percentiles(50, 95, 99)
+        return {
+            "ticks": self.tick,
+            "throughput": self.throughput(),
+            "replan_rate": self.replan_rate(),
+            "collisions_per_1k": self.collisions_per_1k(),
+            "planner_p50_ms": p50,
+            "planner_p95_ms": p95,
+            "planner_p99_ms": p99,
+            "trip_time_mean": self.trip_times.mean(),
+            "trip_time_p95": self.trip_times.percentile(95)
+        }
+
+    def rows(self):
+        """Per-tick rows of the current window, oldest first"""
+        series = [self.ticks, self.arrivals, self.replans, self.collisions,
+                  self.planner_calls, self.planner_ms]
+        return list(zip(*(s.values() for s in series)))
+
+    def sample_rows(self):
+        """Raw planner latency and trip time samples as (kind, value) rows"""
+        return ([("planner_ms", value) for value in self.latencies.values()]
+                + [("trip_ticks", value) for value in self.trip_times.values()])
+
+    def _write_table(self, path, columns, rows):
+        """Write rows as Parquet for .parquet paths and CSV otherwise"""
+        if path.endswith(".parquet"):
+            # Requires pandas and pyarrow
+            import pandas as pd
+            pd.DataFrame(rows, columns=columns).to_parquet(path, index=False)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(rows)
+
+    def export(self, path):
+        """Snapshot the store: per-tick window to path, plus _summary and _samples companion files"""
+        base, ext = os.path.splitext(path)
+        summary = self.summary()
+        self._write_table(path, self.COLUMNS, self.rows())
+        self._write_table(f"{base}_summary{ext}", list(summary), [list(summary.values())])
+        self._write_table(f"{base}_samples{ext}", ["kind", "value"], self.sample_rows())
+
+    def append_rollup(self, path):
+        """Append one row of summary() aggregates to a CSV history file
+
+        Called once per completed window so long runs keep their history on
+        disk while the store itself stays fixed-size.
+        """
+        summary = self.summary()
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(list(summary))
+            writer.writerow(list(summary.values()))
@@ -1,54 +1,76 @@
 import pygame
-import random
 from components.car import Car
-from components.pathfinding import a_star, manhattan_distance
-from utils.config import GRID_WIDTH, GRID_HEIGHT
+from components.goal_assignment import GoalAssigner
+from components.pathfinding import a_star
 
 class MultiCar:
     """Class for handling multiple cars and traffic simulation"""
     
-    def __init__(self, grid, num_cars, car_image_path):
+    def __init__(self, grid, num_cars, car_image_path, congestion_map=None):
         self.grid = grid
         self.cars = []
         self.car_image_path = car_image_path
+        self.congestion_map = congestion_map  # Optional CongestionMap for weighted routing
+        
+        self.goal_assigner = GoalAssigner(grid)
+        self.recalculations = 0      # Replans caused by blocked or missing paths
+        self.ticks = 0
+        self.trip_starts = {}        # Car -> tick its current trip started
+        self.completed_trips = []    # Trip durations in ticks, drained by the metrics store
         
         # Generate random start and goal positions for each car
+        starts = set()
         for _ in range(num_cars):
-            # Try to find unoccupied positions
-            start_pos = self._get_random_unoccupied_position()
-            goal_pos = self._get_random_unoccupied_position()
+            # Sample an unoccupied start not shared with another car
+            start_pos = self._get_random_unoccupied_position(starts)
+            if start_pos is None:
+                break  # Grid is full
+            starts.add(start_pos)
             
-            # Ensure start and goal are different positions
-            while manhattan_distance(start_pos, goal_pos) < 5:
-                goal_pos = self._get_random_unoccupied_position()
+            # Pick a reachable goal, or stay put until one becomes available
+            goal_pos = self.goal_assigner.assign(start_pos)
+            has_goal = goal_pos is not None
+            goal_pos = goal_pos or start_pos
             
             # Create and add the car
             car = Car(start_pos[0], start_pos[1], goal_pos[0], goal_pos[1], car_image_path)
             self.cars.append(car)
+            if has_goal:
+                self.trip_starts[car] = 0
             
             # Calculate initial path
-            car.path = a_star(self.grid, (car.x, car.y), (car.goal_x, car.goal_y)) or []
+            car.path = self._plan(car)
     
-    def _get_random_unoccupied_position(self):
-        """Find a random unoccupied position on the grid"""
-        while True:
-            x = random.randint(0, GRID_WIDTH - 1)
-            y = random.randint(0, GRID_HEIGHT - 1)
-            
-            if not self.grid.is_occupied(x, y):
-                return (x, y)
+    def _plan(self, car):
+        """Plan a path from the car's position to its goal"""
+        return a_star(self.grid, (car.x, car.y), (car.goal_x, car.goal_y), self.congestion_map) or []
+
+    def _get_random_unoccupied_position(self, exclude=None):
+        """Sample a random unoccupied position on the grid, or None if there is none"""
+        return self.grid.free_cells.sample(exclude)
     
     def update(self):
         """Update all cars, recalculate paths if necessary"""
+        self.ticks += 1
         car_positions = {(car.x, car.y) for car in self.cars}
         
-        for car in self.cars:
-            # Check if car has reached its goal
-            if (car.x, car.y) == (car.goal_x, car.goal_y):
-                # Set new random goal
-                new_goal = self._get_random_unoccupied_position()
+        # Give every car that reached its goal, or whose goal got walled off, a new one in a single batch
+        arrived = [car for car in self.cars
+                   if (car.x, car.y) == (car.goal_x, car.goal_y)
+                   or not self.grid.components.is_reachable((car.x, car.y), (car.goal_x, car.goal_y))]
+        new_goals = self.goal_assigner.assign_batch([(car.x, car.y) for car in arrived])
+        for car, new_goal in zip(arrived, new_goals):
+            if (car.x, car.y) == (car.goal_x, car.goal_y) and car in self.trip_starts:
+                self.completed_trips.append(self.ticks - self.trip_starts.pop(car))
+            if new_goal is not None:
                 car.goal_x, car.goal_y = new_goal
-                car.path = a_star(self.grid, (car.x, car.y), (car.goal_x, car.goal_y)) or []
+                car.path = self._plan(car)
+                self.trip_starts[car] = self.ticks
+        waiting = set(arrived)
+        
+        for car in self.cars:
+            # Cars that just got a new goal wait for the next tick
+            if car in waiting:
                 continue
                 
             # Move the car if it has a path
@@ -59,7 +81,8 @@ class MultiCar:
                 # If next position is occupied by another car, recalculate path
                 if next_pos in car_positions and next_pos != (car.x, car.y):
                     # Wait this turn and recalculate
-                    car.path = a_star(self.grid, (car.x, car.y), (car.goal_x, car.goal_y)) or []
+                    car.path = self._plan(car)
+                    self.recalculations += 1
                 else:
                     # Safe to move
                     car_positions.remove((car.x, car.y))
@@ -67,7 +90,18 @@ class MultiCar:
                     car_positions.add((car.x, car.y))
             else:
                 # No path exists, try to recalculate
-                car.path = a_star(self.grid, (car.x, car.y), (car.goal_x, car.goal_y)) or []
+                car.path = self._plan(car)
+                self.recalculations += 1
+
+        # Feed this tick's car positions into the congestion map in one batch
+        if self.congestion_map is not None:
+            self.congestion_map.record(car_positions)
+    
+    def drain_completed_trips(self):
+        """Return and clear the trip durations completed since the last call"""
+        trips = self.completed_trips
+        self.completed_trips = []
+        return trips
     
     def draw(self, screen):
         """Draw all cars"""
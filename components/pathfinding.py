@@ -1,4 +1,15 @@
 import heapq
+import time
+from collections import deque
+
+# Recent planner latencies in milliseconds, drained by the metrics store each tick
+planner_latencies = deque(maxlen=1000)
+
+def drain_planner_latencies():
+    """Return and clear the planner latencies recorded since the last call"""
+    latencies = list(planner_latencies)
+    planner_latencies.clear()
+    return latencies
 
 def manhattan(a, b):
     """Calculate Manhattan distance between two points"""
@@ -8,8 +19,23 @@ def manhattan_distance(a, b):
     """Calculate Manhattan distance between two points"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def a_star(grid, start, goal):
-    """A* pathfinding algorithm"""
+def a_star(grid, start, goal, cost_map=None):
+    """A* pathfinding algorithm
+
+    If a cost_map (e.g. CongestionMap) is given, entering a cell costs 1 plus
+    cost_map.cost(x, y); otherwise every free cell costs 1.
+    """
+    began = time.perf_counter()
+    path = _a_star_search(grid, start, goal, cost_map)
+    planner_latencies.append((time.perf_counter() - began) * 1000)
+    return path
+
+def _a_star_search(grid, start, goal, cost_map):
+    """Search behind a_star, without the latency bookkeeping"""
+    # Unreachable goals are answered in O(1) instead of exploring the whole region
+    if start != goal and (grid.is_occupied(*goal) or not grid.components.is_reachable(start, goal)):
+        return None
+
     open_list = [(0, start)]
     g_cost = {start: 0}
     f_cost = {start: manhattan(start, goal)}
@@ -34,6 +60,8 @@ def a_star(grid, start, goal):
 
             if 0 <= nx < grid.width and 0 <= ny < grid.height and not grid.is_occupied(nx, ny):
                 new_g_cost = g_cost[current] + 1
+                if cost_map is not None:
+                    new_g_cost += cost_map.cost(nx, ny)
 
                 if neighbor not in g_cost or new_g_cost < g_cost[neighbor]:
                     g_cost[neighbor] = new_g_cost
@@ -8,8 +8,11 @@ from components.static_obstacle import StaticObstacle
 from components.multi_car import MultiCar
 from components.traffic_manager import TrafficManager
 from components.metrics_panel import MetricsPanel
+from components.metrics_store import MetricsStore
+from components.congestion import CongestionMap
 from components.pathfinding import a_star
-from utils.config import GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, FPS, GREY, WHITE
+from utils.config import (GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, FPS, GREY, WHITE, USE_CONGESTION_ROUTING,
+                          METRICS_EXPORT_PATH, METRICS_HISTORY_PATH, METRICS_FLUSH_INTERVAL)
 
 # Pygame initialization
 pygame.init()
@@ -48,7 +51,7 @@ def place_static_obstacles():
     static_obstacles = []
     
     # Clear all static obstacles from grid
-    grid.static_obstacles.clear()
+    grid.clear_static_obstacles()
     
     # Important positions to avoid (player start/goal)
     important_positions = {
@@ -61,21 +64,16 @@ def place_static_obstacles():
     }
     
     for _ in range(num_static_obstacles):
-        attempts = 0
-        while attempts < 20:  # Limit attempts to prevent infinite loop
-            x = random.randint(0, GRID_WIDTH - 1)
-            y = random.randint(0, GRID_HEIGHT - 1)
+        # Sample straight from the free cells, skipping important positions
+        position = grid.free_cells.sample(important_positions)
+        if position is None:
+            break  # No free cell left
             
-            # Skip if position is important or already occupied
-            if (x, y) in important_positions or grid.is_occupied(x, y):
-                attempts += 1
-                continue
-                
-            # Create and place the obstacle
-            obstacle = StaticObstacle(x, y)
-            static_obstacles.append(obstacle)
-            grid.add_static_obstacle(x, y)
-            break
+        # Create and place the obstacle
+        x, y = position
+        obstacle = StaticObstacle(x, y)
+        static_obstacles.append(obstacle)
+        grid.add_static_obstacle(x, y)
 
 # Place initial static obstacles
 place_static_obstacles()
@@ -94,14 +92,18 @@ dynamic_obstacles = [
 for obstacle in dynamic_obstacles:
     grid.add_dynamic_obstacle(obstacle.x, obstacle.y)
 
+# Traffic density cost layer for congestion-aware routing (None = plain shortest paths)
+congestion_map = CongestionMap() if USE_CONGESTION_ROUTING else None
+
 # Create traffic cars
-traffic = MultiCar(grid, 5, TRAFFIC_CAR_IMAGE)
+traffic = MultiCar(grid, 5, TRAFFIC_CAR_IMAGE, congestion_map)
 
 # Create traffic manager
 traffic_manager = TrafficManager(grid, player_car, traffic, dynamic_obstacles)
 
-# Create metrics panel
-metrics_panel = MetricsPanel(PANEL_WIDTH)
+# Create fixed-memory metrics history and the panel showing it
+metrics_store = MetricsStore()
+metrics_panel = MetricsPanel(PANEL_WIDTH, metrics_store)
 
 # Simulation loop
 clock = pygame.time.Clock()
@@ -134,13 +136,23 @@ while running:
                 running = False
             elif event.key == pygame.K_p:  # Pause/Resume
                 paused = not paused
+            elif event.key == pygame.K_e:  # Export metrics window
+                try:
+                    metrics_store.export(METRICS_EXPORT_PATH)
+                    metrics_panel.set_status("Exported")
+                except (ImportError, OSError) as e:
+                    # Keep the simulation running if pandas/pyarrow are missing or the file can't be written
+                    metrics_panel.set_status("Export failed")
+                    print(f"Metrics export failed: {e}")
             elif event.key == pygame.K_r:  # Reset
                 # Reset player car
                 player_car = Car(start_x, start_y, goal_x, goal_y, PLAYER_CAR_IMAGE)
-                player_car.path = a_star(grid, (start_x, start_y), (goal_x, goal_y)) or []
+                player_car.path = a_star(grid, (start_x, start_y), (goal_x, goal_y), congestion_map) or []
                 
                 # Reset traffic
-                traffic = MultiCar(grid, 5, TRAFFIC_CAR_IMAGE)
+                if congestion_map is not None:
+                    congestion_map.reset()
+                traffic = MultiCar(grid, 5, TRAFFIC_CAR_IMAGE, congestion_map)
                 
                 # Reset traffic manager
                 traffic_manager = TrafficManager(grid, player_car, traffic, dynamic_obstacles)
@@ -173,7 +185,7 @@ while running:
                 
                 # Recalculate paths after obstacle change
                 player_car.path = a_star(grid, (player_car.x, player_car.y), 
-                                        (player_car.goal_x, player_car.goal_y)) or []
+                                        (player_car.goal_x, player_car.goal_y), congestion_map) or []
                 player_car.recalculations += 1
 
     if not paused:
@@ -191,7 +203,7 @@ while running:
         if path_timer >= PATH_RECALC_INTERVAL:
             if not player_car.path:
                 player_car.path = a_star(grid, (player_car.x, player_car.y), 
-                                        (player_car.goal_x, player_car.goal_y)) or []
+                                        (player_car.goal_x, player_car.goal_y), congestion_map) or []
                 player_car.recalculations += 1
             path_timer = 0
 
@@ -212,6 +224,17 @@ while running:
         traffic.update()
         for car in traffic.cars:
             car.update_animation()
+        
+        # Record this tick in the metrics history
+        metrics_store.update(player_car, traffic, traffic_manager)
+        
+        # Append a rollup of each completed window so long runs keep their history
+        if metrics_store.tick % METRICS_FLUSH_INTERVAL == 0:
+            try:
+                metrics_store.append_rollup(METRICS_HISTORY_PATH)
+            except OSError as e:
+                metrics_panel.set_status("History failed")
+                print(f"Metrics history write failed: {e}")
 
     # Draw everything
     grid.draw(screen, goal_x, goal_y)
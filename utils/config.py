@@ -26,4 +26,21 @@ CAR_SPEED = 2     # Speed factor for the car
 # Simulation settings
 OBSTACLE_MOVE_INTERVAL = 90  # Frames between obstacle movements
 PATH_RECALC_INTERVAL = 60    # Frames between path recalculations
-TRAFFIC_DENSITY = 5          # Number of AI-controlled cars
\ No newline at end of file
+TRAFFIC_DENSITY = 5          # Number of AI-controlled cars
+
+# Congestion-aware routing
+USE_CONGESTION_ROUTING = True  # Weight planner edges by recent traffic density
+CONGESTION_DECAY = 0.98        # Per-tick decay factor of the traffic density counters
+CONGESTION_WEIGHT = 0.05       # Extra cost per unit of density when entering a cell
+
+# Goal assignment
+GOAL_MIN_DISTANCE = 5          # Preferred minimum Manhattan distance between start and goal
+GOAL_SAMPLE_ATTEMPTS = 50      # Bounded number of samples when looking for a goal
+
+# Metrics history
+METRICS_WINDOW = 600           # Ticks kept in the rolling metrics window
+METRICS_LATENCY_SAMPLES = 1000 # Most recent planner latencies kept for percentiles
+METRICS_TRIP_SAMPLES = 200     # Most recent trip times kept
+METRICS_EXPORT_PATH = "metrics.csv"  # File written by the E key (.csv or .parquet)
+METRICS_HISTORY_PATH = "metrics_history.csv"  # CSV receiving one rollup row per window
+METRICS_FLUSH_INTERVAL = METRICS_WINDOW       # Ticks between rollup rows